@@ -0,0 +1,96 @@
+"""
+Risk classification core for analyze.py.
+
+Pure computation on the parsed API response (no I/O). Kept in its own module,
+with full type annotations, so it can optionally be compiled ahead of time:
+
+    mypyc _risk_core.py
+
+The compiled extension sits next to this file and is picked up by
+`import _risk_core` in analyze.py in place of the source.
+"""
+
+from collections import Counter
+from operator import itemgetter
+from typing import Any
+
+# Time periods reported by the API, in output order
+PERIODS: tuple[str, ...] = ("dawn", "morning", "afternoon", "night")
+
+# Period max scores for risk calculation
+PERIOD_MAX_SCORES: dict[str, float] = {
+    "dawn": 128000.0,
+    "afternoon": 165000.0,
+    "morning": 185000.0,
+    "night": 300000.0
+}
+
+# (high, medium) risk thresholds per period: 70% / 30% of the period max score
+PERIOD_THRESHOLDS: dict[str, tuple[float, float]] = {
+    period: (max_score * 0.70, max_score * 0.30)
+    for period, max_score in PERIOD_MAX_SCORES.items()
+}
+_DEFAULT_THRESHOLDS: tuple[float, float] = (200000.0 * 0.70, 200000.0 * 0.30)
+
+_RISK_LABELS: dict[str, str] = {"high": "HIGH", "medium": "MEDIUM", "low": "LOW"}
+
+
+def classify_risk(score: float, period: str) -> str:
+    """Classify risk level based on score and period thresholds."""
+    high_threshold, medium_threshold = PERIOD_THRESHOLDS.get(period, _DEFAULT_THRESHOLDS)
+    
+    if score > high_threshold:
+        return "high"
+    elif score > medium_threshold:
+        return "medium"
+    else:
+        return "low"
+
+
+def get_risk_label(risk_level: str) -> str:
+    """Get label for risk level."""
+    return _RISK_LABELS.get(risk_level, "UNKNOWN")
+
+
+def reduce_analysis(response: dict[str, Any]) -> tuple[dict[str, Any], dict[str, Any], Counter[Any]]:
+    """Reduce a parsed analysis response to location, per-period data and crime counts."""
+    location: dict[str, Any] = response.get("location", {})
+    content: dict[str, Any] = response.get("content", {})
+    all_crimes: Counter[Any] = Counter()  # crime_type_id -> total count
+    
+    for period_name in PERIODS:
+        period_data: dict[str, Any] = content.get(period_name, {})
+        occurrences: list[dict[str, Any]] = period_data.get("occurrencesWithinCriminalDangerZones", [])
+        for occ in occurrences:
+            all_crimes[occ.get("crimeType", 0)] += occ.get("count", 0)
+    
+    return location, content, all_crimes
+
+
+def aggregate_periods(content: dict[str, Any]) -> tuple[list[dict[str, Any]], str, str]:
+    """
+    Classify each time period and pick the highest risk one.
+    
+    Returns (periods, highest risk period, overall risk). Scores and positions
+    are passed through as the API sent them (int or float), so the output is
+    the same whether or not this module is compiled.
+    """
+    periods: list[dict[str, Any]] = []
+    
+    for period_name in PERIODS:
+        period_data: dict[str, Any] = content.get(period_name, {})
+        score: int | float = period_data.get("score", 0)
+        position = period_data.get("scorePosition", 0)
+        risk_level = classify_risk(score, period_name)
+        
+        periods.append({
+            "period": period_name,
+            "score": score,
+            "position": position,
+            "riskLevel": risk_level,
+            "riskLabel": get_risk_label(risk_level)
+        })
+    
+    # Determine overall risk (based on highest risk period, first one wins ties)
+    highest_risk = max(periods, key=itemgetter("score"))
+    return periods, highest_risk["period"], highest_risk["riskLevel"]
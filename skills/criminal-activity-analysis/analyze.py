@@ -12,102 +12,346 @@ Usage:
 Environment:
     CRIMINAL_ANALYSIS_API_KEY - Required API key for authentication
     CRIMINAL_ANALYSIS_API_URL - Optional base URL (default: http://thomas:11004)
+    CRIMINAL_ANALYSIS_CACHE_TTL - Optional crime type cache TTL in seconds (default: 7 days)
+    CRIMINAL_ANALYSIS_BATCH_TYPES - Optional; set to 1 if the API supports types:batchGet
+    http_proxy / https_proxy / no_proxy - Honored; proxied requests go through urllib
+
+Direct requests reuse pooled keep-alive connections and do not follow redirects.
 """
 
 import argparse
+import atexit
+import functools
+import heapq
 import json
 import os
+import re
 import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from http.client import (
+    HTTPConnection,
+    HTTPException,
+    HTTPResponse,
+    HTTPSConnection,
+    RemoteDisconnected,
+)
+from operator import itemgetter
 from typing import Optional
-from urllib.request import Request, urlopen
+from urllib.parse import urlsplit
+from urllib.request import Request, getproxies, proxy_bypass, urlopen
 from urllib.error import URLError, HTTPError
 
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is used otherwise
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import ijson  # type: ignore[import-untyped]
+except ImportError:  # optional; the analysis response is parsed in full otherwise
+    ijson = None
+
+from _risk_core import PERIODS, aggregate_periods, get_risk_label, reduce_analysis
+
 
 # Configuration
 DEFAULT_API_URL = "http://thomas:11004"
 TOP_CRIMES_LIMIT = 10
+HTTP_TIMEOUT = 30
+HTTP_POOL_SIZE = 4  # max idle keep-alive connections kept per host
+DEFAULT_CACHE_TTL = 7 * 24 * 60 * 60
+CRIME_TYPE_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "openclaw", "crime_types")
 
-# Period max scores for risk calculation
-PERIOD_MAX_SCORES = {
-    "dawn": 128000.0,
-    "afternoon": 165000.0,
-    "morning": 185000.0,
-    "night": 300000.0
-}
+# Max crime types kept in memory (avoid repeated API calls)
+CRIME_TYPE_CACHE_SIZE = 256
 
-# Cache for crime types (avoid repeated API calls)
-CRIME_TYPE_CACHE: dict[int, dict] = {}
+# Where crime type lookups were served from, for --debug (in-memory hits come from cache_info())
+_LOOKUP_STATS: Counter[str] = Counter()
+_LOOKUP_STATS_LOCK = threading.Lock()
 
+# Idle keep-alive connections per (scheme, netloc), shared by all threads
+_POOL: dict[tuple[str, str], list[HTTPConnection]] = {}
+_POOL_LOCK = threading.Lock()
 
+# Errors that mean a pooled keep-alive socket was closed by the server while idle
+_STALE_CONNECTION_ERRORS = (RemoteDisconnected, ConnectionResetError, BrokenPipeError)
+
+
+@functools.lru_cache(maxsize=1)
 def get_api_key() -> str:
-    """Get API key from environment."""
+    """Get API key from environment (read once per process)."""
     key = os.environ.get("CRIMINAL_ANALYSIS_API_KEY")
     if not key:
         raise EnvironmentError("CRIMINAL_ANALYSIS_API_KEY environment variable is required")
     return key
 
 
+@functools.lru_cache(maxsize=1)
 def get_base_url() -> str:
-    """Get API base URL from environment or use default."""
+    """Get API base URL from environment or use default (read once per process)."""
     return os.environ.get("CRIMINAL_ANALYSIS_API_URL", DEFAULT_API_URL)
 
 
-def classify_risk(score: float, period: str) -> str:
-    """Classify risk level based on score and period thresholds."""
-    max_score = PERIOD_MAX_SCORES.get(period, 200000.0)
-    high_threshold = max_score * 0.70
-    medium_threshold = max_score * 0.30
-    
-    if score > high_threshold:
-        return "high"
-    elif score > medium_threshold:
-        return "medium"
-    else:
-        return "low"
+@functools.lru_cache(maxsize=1)
+def batch_types_enabled() -> bool:
+    """Whether to use the types:batchGet endpoint (opt-in; not every API has it)."""
+    value = os.environ.get("CRIMINAL_ANALYSIS_BATCH_TYPES", "")
+    return value.strip().lower() in ("1", "true", "yes", "on")
 
 
-def get_risk_label(risk_level: str) -> str:
-    """Get label for risk level."""
-    return {"high": "HIGH", "medium": "MEDIUM", "low": "LOW"}.get(risk_level, "UNKNOWN")
+def get_cache_ttl() -> float:
+    """Get crime type cache TTL in seconds from environment or use default."""
+    try:
+        return float(os.environ.get("CRIMINAL_ANALYSIS_CACHE_TTL", DEFAULT_CACHE_TTL))
+    except ValueError:
+        return float(DEFAULT_CACHE_TTL)
 
 
-def fetch_json(url: str, method: str = "GET", data: Optional[bytes] = None, 
-               headers: Optional[dict] = None) -> dict:
-    """Make HTTP request and return JSON response."""
-    req = Request(url, data=data, method=method)
-    req.add_header("X-API-KEY", get_api_key())
-    req.add_header("Accept", "application/json")
-    
-    if headers:
-        for key, value in headers.items():
-            req.add_header(key, value)
-    
+def json_loads(raw: bytes):
+    """Parse a JSON document from raw bytes."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)  # accepts bytes directly, no intermediate str
+
+
+def json_dumps(obj, pretty: bool = False) -> str:
+    """Serialize an object to a JSON string (non-ASCII kept as-is)."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0).decode("utf-8")
+    return json.dumps(obj, indent=2 if pretty else None, ensure_ascii=False)
+
+
+def _crime_type_cache_path(crime_type_id: int) -> str:
+    """Get the on-disk cache file for a crime type, namespaced by API host."""
+    netloc = urlsplit(get_base_url()).netloc.rpartition("@")[2]
+    host_dir = re.sub(r"[^A-Za-z0-9.-]", "_", netloc).strip(".") or "_"
+    return os.path.join(CRIME_TYPE_CACHE_DIR, host_dir, f"{crime_type_id}.json")
+
+
+def _read_disk_cache(crime_type_id: int) -> Optional[dict]:
+    """Read a cached crime type from disk, ignoring stale, unreadable or malformed entries."""
+    # Only plain integer IDs map to a file name; anything else from the API is not cached
+    if type(crime_type_id) is not int:
+        return None
+    path = _crime_type_cache_path(crime_type_id)
     try:
-        with urlopen(req, timeout=30) as response:
-            return json.loads(response.read().decode("utf-8"))
+        if time.time() - os.path.getmtime(path) > get_cache_ttl():
+            return None
+        with open(path, "rb") as handle:
+            crime_type = json_loads(handle.read())
+    except (OSError, ValueError):
+        return None
+    return crime_type if isinstance(crime_type, dict) else None
+
+
+def _write_disk_cache(crime_type_id: int, crime_type: dict) -> None:
+    """Atomically write a crime type to the on-disk cache (best effort)."""
+    if type(crime_type_id) is not int:
+        return
+    path = _crime_type_cache_path(crime_type_id)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump(crime_type, handle, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError:
+        pass
+
+
+@functools.lru_cache(maxsize=1)
+def _default_headers() -> dict:
+    """Headers sent with every request (built once)."""
+    return {"X-API-KEY": get_api_key(), "Accept": "application/json"}
+
+
+def _uses_proxy(scheme: str, host: str) -> bool:
+    """Whether http_proxy/https_proxy (and no_proxy) route this host through a proxy."""
+    return scheme in getproxies() and not proxy_bypass(host)
+
+
+def _checkout_connection(scheme: str, netloc: str, reuse: bool = True) -> tuple[HTTPConnection, bool]:
+    """Take an idle pooled connection for the host, or open a new one. Returns (conn, reused)."""
+    if reuse:
+        with _POOL_LOCK:
+            idle = _POOL.get((scheme, netloc))
+            if idle:
+                return idle.pop(), True
+    conn_class = HTTPSConnection if scheme == "https" else HTTPConnection
+    return conn_class(netloc, timeout=HTTP_TIMEOUT), False
+
+
+def _release_connection(scheme: str, netloc: str, conn: HTTPConnection) -> None:
+    """Return a connection to the pool for reuse, closing it if the pool is full."""
+    with _POOL_LOCK:
+        idle = _POOL.setdefault((scheme, netloc), [])
+        if len(idle) < HTTP_POOL_SIZE:
+            idle.append(conn)
+            return
+    conn.close()
+
+
+@atexit.register
+def _close_pool() -> None:
+    """Close all idle pooled connections."""
+    with _POOL_LOCK:
+        for idle in _POOL.values():
+            for conn in idle:
+                conn.close()
+        _POOL.clear()
+
+
+def _open_via_urllib(url: str, method: str, data: Optional[bytes], headers: dict) -> HTTPResponse:
+    """Send HTTP request with urlopen (proxy support, redirects) and return the unread response."""
+    req = Request(url, data=data, method=method, headers=headers)
+    try:
+        return urlopen(req, timeout=HTTP_TIMEOUT)
     except HTTPError as e:
-        error_body = e.read().decode("utf-8") if e.fp else ""
+        error_body = e.read().decode("utf-8", "replace") if e.fp else ""
         raise RuntimeError(f"API error {e.code}: {error_body}")
     except URLError as e:
         raise RuntimeError(f"Network error: {e.reason}")
-    except json.JSONDecodeError as e:
-        raise RuntimeError(f"Invalid JSON response: {e}")
+    except (HTTPException, OSError) as e:
+        raise RuntimeError(f"Network error: {e}")
+
+
+def _open_response(url: str, method: str = "GET", data: Optional[bytes] = None,
+                   headers: Optional[dict] = None) -> tuple[Optional[HTTPConnection], HTTPResponse]:
+    """
+    Send HTTP request and return (connection, unread response).
+    
+    The connection is None when the request went through urllib (proxy);
+    pass both to _finish_response() once the body is no longer needed.
+    """
+    parts = urlsplit(url)
+    request_headers = _default_headers()
+    if headers:
+        request_headers = {**request_headers, **headers}
+    
+    if _uses_proxy(parts.scheme, parts.hostname or ""):
+        return None, _open_via_urllib(url, method, data, request_headers)
+    
+    path = parts.path or "/"
+    if parts.query:
+        path = f"{path}?{parts.query}"
+    
+    # A reused keep-alive socket may have been closed by the server while idle;
+    # only then is the request resent, once, on a fresh connection
+    for attempt in range(2):
+        conn, reused = _checkout_connection(parts.scheme, parts.netloc, reuse=not attempt)
+        try:
+            conn.request(method, path, body=data, headers=request_headers)
+            response = conn.getresponse()
+            break
+        except _STALE_CONNECTION_ERRORS as e:
+            conn.close()
+            if not reused:
+                raise RuntimeError(f"Network error: {e}")
+        except (HTTPException, OSError) as e:
+            conn.close()
+            raise RuntimeError(f"Network error: {e}")
+    
+    if response.status >= 400:
+        body = _finish_response(url, conn, response)
+        raise RuntimeError(f"API error {response.status}: {body.decode('utf-8', 'replace')}")
+    
+    return conn, response
+
+
+def _discard_response(conn: Optional[HTTPConnection], response: HTTPResponse) -> None:
+    """Close a response and its connection without reading the rest of the body."""
+    response.close()
+    if conn is not None:
+        conn.close()
 
 
-def get_crime_type(crime_type_id: int) -> dict:
-    """Fetch crime type details by ID (with caching)."""
-    if crime_type_id in CRIME_TYPE_CACHE:
-        return CRIME_TYPE_CACHE[crime_type_id]
+def _finish_response(url: str, conn: Optional[HTTPConnection], response: HTTPResponse) -> bytes:
+    """Read the rest of a response body and hand its connection back to the pool."""
+    try:
+        body = response.read()
+    except (HTTPException, OSError) as e:
+        _discard_response(conn, response)
+        raise RuntimeError(f"Network error: {e}")
     
+    if conn is None:
+        response.close()
+    elif response.will_close:
+        conn.close()
+    else:
+        parts = urlsplit(url)
+        _release_connection(parts.scheme, parts.netloc, conn)
+    return body
+
+
+def fetch_json(url: str, method: str = "GET", data: Optional[bytes] = None, 
+               headers: Optional[dict] = None) -> dict:
+    """Make HTTP request over a pooled keep-alive connection and return JSON response."""
+    conn, response = _open_response(url, method=method, data=data, headers=headers)
+    body = _finish_response(url, conn, response)
+    
+    try:
+        return json_loads(body)
+    except json.JSONDecodeError as e:  # orjson.JSONDecodeError subclasses this
+        raise RuntimeError(f"Invalid JSON response: {e}")
+
+
+def _record_lookup(source: str, count: int = 1) -> None:
+    """Count crime type lookups served from the given source."""
+    with _LOOKUP_STATS_LOCK:
+        _LOOKUP_STATS[source] += count
+
+
+def crime_type_cache_stats() -> dict:
+    """Get crime type lookup counts per source (memory, disk, batch, api, failed)."""
+    with _LOOKUP_STATS_LOCK:
+        stats = dict(_LOOKUP_STATS)
+    cache_info = fetch_crime_type.cache_info()
+    return {"memory": cache_info.hits, **stats, "memorySize": cache_info.currsize}
+
+
+@functools.lru_cache(maxsize=CRIME_TYPE_CACHE_SIZE)
+def fetch_crime_type(crime_type_id: int) -> dict:
+    """Fetch crime type details by ID (cached in memory and on disk; raises on failure)."""
+    cached = _read_disk_cache(crime_type_id)
+    if cached is not None:
+        _record_lookup("disk")
+        return cached
+    return _download_crime_type(crime_type_id)
+
+
+def _download_crime_type(crime_type_id: int) -> dict:
+    """Fetch crime type details by ID from the API and store them on disk (raises on failure)."""
     base_url = get_base_url()
     url = f"{base_url}/api/v1/criminal/types/{crime_type_id}"
     
+    result = fetch_json(url)
+    _record_lookup("api")
+    _write_disk_cache(crime_type_id, result)
+    return result
+
+
+def get_crime_type(crime_type_id: int, cached: bool = True) -> dict:
+    """
+    Fetch crime type details by ID, falling back to a placeholder on failure.
+    
+    With cached=False the memory and disk caches are not consulted, for IDs
+    the caller has already looked up there.
+    """
     try:
-        result = fetch_json(url)
-        CRIME_TYPE_CACHE[crime_type_id] = result
-        return result
+        if cached:
+            return fetch_crime_type(crime_type_id)
+        return _download_crime_type(crime_type_id)
     except Exception:
-        # Return a fallback if crime type lookup fails
+        # Return a fallback if crime type lookup fails (not cached, so it is retried)
+        _record_lookup("failed")
         return {
             "id": crime_type_id,
             "description": f"Crime Type #{crime_type_id}",
@@ -115,6 +359,113 @@ def get_crime_type(crime_type_id: int) -> dict:
         }
 
 
+def _fetch_crime_type_batch(crime_type_ids: list[int]) -> dict[int, dict]:
+    """Fetch several crime types in one request; returns {} if the batch endpoint fails."""
+    base_url = get_base_url()
+    url = f"{base_url}/api/v1/criminal/types:batchGet"
+    
+    try:
+        response = fetch_json(
+            url,
+            method="POST",
+            data=json_dumps(crime_type_ids).encode("utf-8"),
+            headers={"Content-Type": "application/json"}
+        )
+    except RuntimeError:
+        return {}
+    
+    if not isinstance(response, dict):
+        return {}
+    
+    # Response is keyed by crime type ID (string keys, as in any JSON object)
+    crime_types = {}
+    for crime_type_id in crime_type_ids:
+        crime_type = response.get(str(crime_type_id))
+        if isinstance(crime_type, dict):
+            crime_types[crime_type_id] = crime_type
+            _write_disk_cache(crime_type_id, crime_type)
+    _record_lookup("batch", len(crime_types))
+    return crime_types
+
+
+def get_crime_types(crime_type_ids: list[int]) -> list[dict]:
+    """
+    Fetch crime type details for several IDs, in the same order.
+    
+    Lookups run concurrently through get_crime_type(). When
+    CRIMINAL_ANALYSIS_BATCH_TYPES is set, IDs missing from the disk cache are
+    first requested in a single batch call; only the ones it does not return
+    are then fetched one by one, straight from the API.
+    """
+    # Workers are capped at the pool size so they share its keep-alive connections
+    if not batch_types_enabled():
+        if not crime_type_ids:
+            return []
+        with ThreadPoolExecutor(max_workers=min(len(crime_type_ids), HTTP_POOL_SIZE)) as executor:
+            return list(executor.map(get_crime_type, crime_type_ids))
+    
+    crime_types: dict[int, dict] = {}
+    missing = []
+    for crime_type_id in crime_type_ids:
+        cached = _read_disk_cache(crime_type_id)
+        if cached is not None:
+            _record_lookup("disk")
+            crime_types[crime_type_id] = cached
+        else:
+            missing.append(crime_type_id)
+    
+    if missing:
+        crime_types.update(_fetch_crime_type_batch(missing))
+    
+    remaining = [crime_type_id for crime_type_id in missing if crime_type_id not in crime_types]
+    if remaining:
+        download = functools.partial(get_crime_type, cached=False)
+        with ThreadPoolExecutor(max_workers=min(len(remaining), HTTP_POOL_SIZE)) as executor:
+            crime_types.update(zip(remaining, executor.map(download, remaining)))
+    
+    return [crime_types[crime_type_id] for crime_type_id in crime_type_ids]
+
+
+def _stream_analysis(response: HTTPResponse) -> tuple[dict, dict, Counter]:
+    """
+    Parse an analysis response incrementally with ijson.
+    
+    Same result as reduce_analysis(), but occurrences are counted as they are
+    read instead of first building the whole document.
+    """
+    location: dict = {}
+    content: dict[str, dict] = {}
+    all_crimes: Counter[int] = Counter()  # crime_type_id -> total count
+    crime_type = count = 0
+    
+    for prefix, event, value in ijson.parse(response, use_float=True):
+        section, _, rest = prefix.partition(".")
+        if section == "location":
+            if rest in ("x", "y"):
+                location[rest] = value
+            elif rest == "coordinates" and event == "start_array":
+                location["coordinates"] = []
+            elif rest == "coordinates.item":
+                location["coordinates"].append(value)
+        elif section == "content":
+            period_name, _, field = rest.partition(".")
+            if period_name not in PERIODS:
+                continue
+            if field in ("score", "scorePosition"):
+                content.setdefault(period_name, {})[field] = value
+            elif field == "occurrencesWithinCriminalDangerZones.item":
+                if event == "start_map":
+                    crime_type = count = 0
+                elif event == "end_map":
+                    all_crimes[crime_type] += count
+            elif field == "occurrencesWithinCriminalDangerZones.item.crimeType":
+                crime_type = value
+            elif field == "occurrencesWithinCriminalDangerZones.item.count":
+                count = value
+    
+    return location, content, all_crimes
+
+
 def analyze_location(address: str) -> dict:
     """
     Analyze criminal activity for a location.
@@ -128,56 +479,34 @@ def analyze_location(address: str) -> dict:
     base_url = get_base_url()
     url = f"{base_url}/api/v1/criminal/activity-analysis/analyze"
     
-    # Call the analysis API
-    response = fetch_json(
-        url,
-        method="POST",
-        data=address.encode("utf-8"),
-        headers={"Content-Type": "application/json"}
-    )
+    data = address.encode("utf-8")
+    headers = {"Content-Type": "application/json"}
     
-    # Extract location info
-    location = response.get("location", {})
-    content = response.get("content", {})
+    # Call the analysis API, streaming the (potentially large) response when ijson is available
+    if ijson is not None:
+        conn, response = _open_response(url, method="POST", data=data, headers=headers)
+        try:
+            location, content, all_crimes = _stream_analysis(response)
+        except ijson.JSONError as e:
+            _discard_response(conn, response)
+            raise RuntimeError(f"Invalid JSON response: {e}")
+        except (HTTPException, OSError) as e:
+            _discard_response(conn, response)
+            raise RuntimeError(f"Network error: {e}")
+        # Drain anything after the parsed document so the connection can be reused
+        _finish_response(url, conn, response)
+    else:
+        location, content, all_crimes = reduce_analysis(fetch_json(url, method="POST", data=data, headers=headers))
     
     # Process each time period
-    periods = []
-    all_crimes: dict[int, int] = {}  # crime_type_id -> total count
-    highest_risk_period = None
-    highest_risk_score = -1
-    
-    for period_name in ["dawn", "morning", "afternoon", "night"]:
-        period_data = content.get(period_name, {})
-        score = period_data.get("score", 0)
-        position = period_data.get("scorePosition", 0)
-        risk_level = classify_risk(score, period_name)
-        
-        periods.append({
-            "period": period_name,
-            "score": score,
-            "position": position,
-            "riskLevel": risk_level,
-            "riskLabel": get_risk_label(risk_level)
-        })
-        
-        # Track highest risk period
-        if score > highest_risk_score:
-            highest_risk_score = score
-            highest_risk_period = period_name
-        
-        # Aggregate crime occurrences
-        occurrences = period_data.get("occurrencesWithinCriminalDangerZones", [])
-        for occ in occurrences:
-            crime_type = occ.get("crimeType", 0)
-            count = occ.get("count", 0)
-            all_crimes[crime_type] = all_crimes.get(crime_type, 0) + count
+    periods, highest_risk_period, overall_risk = aggregate_periods(content)
     
     # Get top crimes with names
-    sorted_crimes = sorted(all_crimes.items(), key=lambda x: x[1], reverse=True)
+    selected_crimes = heapq.nlargest(TOP_CRIMES_LIMIT, all_crimes.items(), key=itemgetter(1))
+    crime_infos = get_crime_types([crime_id for crime_id, _ in selected_crimes])
     top_crimes = []
     
-    for crime_id, count in sorted_crimes[:TOP_CRIMES_LIMIT]:
-        crime_info = get_crime_type(crime_id)
+    for (crime_id, count), crime_info in zip(selected_crimes, crime_infos):
         top_crimes.append({
             "id": crime_id,
             "name": crime_info.get("description", f"Crime #{crime_id}"),
@@ -185,9 +514,6 @@ def analyze_location(address: str) -> dict:
             "count": count
         })
     
-    # Determine overall risk (based on highest risk period)
-    overall_risk = classify_risk(highest_risk_score, highest_risk_period) if highest_risk_period else "low"
-    
     return {
         "success": True,
         "location": {
@@ -220,36 +546,41 @@ Examples:
 Environment Variables:
     CRIMINAL_ANALYSIS_API_KEY  Required API key
     CRIMINAL_ANALYSIS_API_URL  Base URL (default: http://thomas:11004)
+    CRIMINAL_ANALYSIS_CACHE_TTL  Crime type cache TTL in seconds (default: 604800)
+    CRIMINAL_ANALYSIS_BATCH_TYPES  Set to 1 to fetch crime types via types:batchGet
         """
     )
     parser.add_argument("address", help="Location to analyze (address, landmark, or neighborhood)")
     parser.add_argument("--pretty", "-p", action="store_true", help="Pretty-print JSON output")
+    parser.add_argument("--debug", action="store_true", help="Print crime type lookup counts per cache layer to stderr")
     
     args = parser.parse_args()
     
     try:
+        # Validate configuration before any network I/O
+        get_api_key()
         result = analyze_location(args.address)
         
-        if args.pretty:
-            print(json.dumps(result, indent=2, ensure_ascii=False))
-        else:
-            print(json.dumps(result, ensure_ascii=False))
+        print(json_dumps(result, pretty=args.pretty))
+        
+        if args.debug:
+            print(f"crime type lookups: {json_dumps(crime_type_cache_stats())}", file=sys.stderr)
         
         return 0
     
     except EnvironmentError as e:
         error_result = {"success": False, "error": "configuration_error", "message": str(e)}
-        print(json.dumps(error_result), file=sys.stderr)
+        print(json_dumps(error_result), file=sys.stderr)
         return 1
     
     except RuntimeError as e:
         error_result = {"success": False, "error": "api_error", "message": str(e)}
-        print(json.dumps(error_result), file=sys.stderr)
+        print(json_dumps(error_result), file=sys.stderr)
         return 1
     
     except Exception as e:
         error_result = {"success": False, "error": "unexpected_error", "message": str(e)}
-        print(json.dumps(error_result), file=sys.stderr)
+        print(json_dumps(error_result), file=sys.stderr)
         return 1
 
 
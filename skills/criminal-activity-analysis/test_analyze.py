@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Tests for analyze.py.
+
+Usage:
+    python3 -m unittest test_analyze.py
+"""
+
+import io
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("CRIMINAL_ANALYSIS_API_KEY", "test-key")
+
+import analyze  # noqa: E402
+
+
+SAMPLE_RESPONSE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "examples", "sample-response.json")
+
+
+def load_sample() -> bytes:
+    with open(SAMPLE_RESPONSE, "rb") as handle:
+        return handle.read()
+
+
+def used_location(location: dict) -> tuple:
+    """The location fields analyze_location() reports (streaming skips the rest)."""
+    return location.get("coordinates", [None, None]), location.get("y"), location.get("x")
+
+
+def used_periods(content: dict) -> list:
+    """The per-period fields analyze_location() reports."""
+    return [
+        (content.get(period, {}).get("score", 0), content.get(period, {}).get("scorePosition", 0))
+        for period in analyze.PERIODS
+    ]
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Answers every request with {"ok": true}; behavior is tuned per server."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _handle(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.server.requests.append((self.command, self.path))
+        if self.server.mode == "hang_up":
+            # Read the request, then close without answering
+            self.close_connection = True
+            return
+        body = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        # "close_after_response": keep-alive is advertised, but the socket is
+        # silently closed, like a server dropping idle connections
+        self.close_connection = self.server.mode == "close_after_response"
+
+    do_GET = _handle
+    do_POST = _handle
+
+
+def start_server(mode: str = "keep_alive") -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.mode = mode
+    server.requests = []
+    server.connections = 0
+    handle_original = server.process_request
+
+    def process_request(request, client_address):
+        server.connections += 1
+        handle_original(request, client_address)
+
+    server.process_request = process_request
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class ConnectionPoolTest(unittest.TestCase):
+    def setUp(self):
+        analyze._close_pool()
+        patcher = mock.patch.object(analyze, "_uses_proxy", return_value=False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(analyze._close_pool)
+
+    def start(self, mode: str = "keep_alive") -> str:
+        server = start_server(mode)
+        self.server = server
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return f"http://127.0.0.1:{server.server_address[1]}"
+
+    def test_requests_reuse_one_connection(self):
+        base_url = self.start()
+        for i in range(5):
+            self.assertEqual(analyze.fetch_json(f"{base_url}/item/{i}"), {"ok": True})
+        self.assertEqual(len(self.server.requests), 5)
+        self.assertEqual(self.server.connections, 1)
+
+    def test_stale_reused_connection_is_retried_once(self):
+        base_url = self.start("close_after_response")
+        analyze.fetch_json(f"{base_url}/first")
+        # Let the server finish closing the pooled socket
+        threading.Event().wait(0.2)
+
+        checkouts = []
+        checkout = analyze._checkout_connection
+
+        def counting_checkout(*args, **kwargs):
+            conn, reused = checkout(*args, **kwargs)
+            checkouts.append(reused)
+            return conn, reused
+
+        with mock.patch.object(analyze, "_checkout_connection", counting_checkout):
+            self.assertEqual(analyze.fetch_json(f"{base_url}/second", method="POST", data=b"x"), {"ok": True})
+
+        self.assertEqual(checkouts, [True, False])
+        self.assertEqual(self.server.requests, [("GET", "/first"), ("POST", "/second")])
+
+    def test_fresh_connection_is_not_retried(self):
+        base_url = self.start("hang_up")
+        with self.assertRaisesRegex(RuntimeError, "Network error"):
+            analyze.fetch_json(f"{base_url}/analyze", method="POST", data=b"x")
+        self.assertEqual(self.server.requests, [("POST", "/analyze")])
+        self.assertEqual(self.server.connections, 1)
+
+
+class ProxyTest(unittest.TestCase):
+    def test_proxied_requests_go_through_urllib(self):
+        proxy = start_server()
+        self.addCleanup(proxy.server_close)
+        self.addCleanup(proxy.shutdown)
+        proxy_url = f"http://127.0.0.1:{proxy.server_address[1]}"
+
+        with mock.patch.dict(os.environ, {"http_proxy": proxy_url, "no_proxy": ""}):
+            self.assertEqual(analyze.fetch_json("http://thomas.invalid:11004/api/x"), {"ok": True})
+
+        self.assertEqual(proxy.requests, [("GET", "http://thomas.invalid:11004/api/x")])
+
+
+class DiskCacheTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.cache_dir = tmp.name
+        for patcher in (
+            mock.patch.object(analyze, "CRIME_TYPE_CACHE_DIR", tmp.name),
+            mock.patch.object(analyze, "get_base_url", return_value="http://thomas:11004"),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def cached_files(self) -> list:
+        return sorted(
+            os.path.relpath(os.path.join(root, name), self.cache_dir)
+            for root, _, names in os.walk(self.cache_dir)
+            for name in names
+        )
+
+    def test_round_trip_replaces_atomically(self):
+        analyze._write_disk_cache(497, {"id": 497, "description": "old"})
+        analyze._write_disk_cache(497, {"id": 497, "description": "Furto"})
+
+        self.assertEqual(analyze._read_disk_cache(497), {"id": 497, "description": "Furto"})
+        self.assertEqual(self.cached_files(), [os.path.join("thomas_11004", "497.json")])
+
+    def test_expired_entries_are_ignored(self):
+        analyze._write_disk_cache(497, {"id": 497})
+        path = analyze._crime_type_cache_path(497)
+        old = time.time() - 120
+        os.utime(path, (old, old))
+
+        with mock.patch.dict(os.environ, {"CRIMINAL_ANALYSIS_CACHE_TTL": "60"}):
+            self.assertIsNone(analyze._read_disk_cache(497))
+        with mock.patch.dict(os.environ, {"CRIMINAL_ANALYSIS_CACHE_TTL": "600"}):
+            self.assertEqual(analyze._read_disk_cache(497), {"id": 497})
+
+    def test_non_object_entries_are_ignored(self):
+        analyze._write_disk_cache(497, {"id": 497})
+        with open(analyze._crime_type_cache_path(497), "w", encoding="utf-8") as handle:
+            handle.write("[]")
+
+        self.assertIsNone(analyze._read_disk_cache(497))
+
+    def test_non_int_ids_are_not_cached(self):
+        for crime_type_id in ("497", "../497", None, 497.0):
+            analyze._write_disk_cache(crime_type_id, {"id": crime_type_id})
+            self.assertIsNone(analyze._read_disk_cache(crime_type_id))
+        self.assertEqual(self.cached_files(), [])
+
+    def test_entries_are_per_api_host(self):
+        analyze._write_disk_cache(497, {"id": 497})
+        with mock.patch.object(analyze, "get_base_url", return_value="http://other-api:8080"):
+            self.assertIsNone(analyze._read_disk_cache(497))
+
+
+class CrimeTypesTest(unittest.TestCase):
+    def setUp(self):
+        self.download = mock.Mock(side_effect=lambda crime_type_id: {"id": crime_type_id, "source": "api"})
+        self.batch = mock.Mock(return_value={2: {"id": 2, "source": "batch"}})
+        self.read_disk = mock.Mock(side_effect=lambda crime_type_id: {"id": 1, "source": "disk"} if crime_type_id == 1 else None)
+        for patcher in (
+            mock.patch.object(analyze, "_download_crime_type", self.download),
+            mock.patch.object(analyze, "_fetch_crime_type_batch", self.batch),
+            mock.patch.object(analyze, "_read_disk_cache", self.read_disk),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        analyze.fetch_crime_type.cache_clear()
+        self.addCleanup(analyze.fetch_crime_type.cache_clear)
+
+    def test_batch_disabled_looks_up_each_id(self):
+        with mock.patch.object(analyze, "batch_types_enabled", return_value=False):
+            crime_types = analyze.get_crime_types([3, 1, 2])
+
+        self.assertEqual([crime_type["source"] for crime_type in crime_types], ["api", "disk", "api"])
+        self.batch.assert_not_called()
+
+    def test_batch_leftovers_skip_checked_cache_layers(self):
+        with mock.patch.object(analyze, "batch_types_enabled", return_value=True):
+            crime_types = analyze.get_crime_types([3, 1, 2])
+
+        self.assertEqual([crime_type["source"] for crime_type in crime_types], ["api", "disk", "batch"])
+        self.batch.assert_called_once_with([3, 2])
+        self.assertEqual(sorted(call.args[0] for call in self.read_disk.call_args_list), [1, 2, 3])
+        self.download.assert_called_once_with(3)
+
+    def test_batch_leftover_failures_fall_back(self):
+        self.download.side_effect = RuntimeError("Network error: down")
+        with mock.patch.object(analyze, "batch_types_enabled", return_value=True):
+            crime_types = analyze.get_crime_types([3])
+
+        self.assertEqual(crime_types, [{"id": 3, "description": "Crime Type #3", "score": 1}])
+
+
+class ParsePathsTest(unittest.TestCase):
+    def assert_stream_matches_full_parse(self, raw: bytes):
+        location, content, all_crimes = analyze.reduce_analysis(analyze.json_loads(raw))
+        s_location, s_content, s_all_crimes = analyze._stream_analysis(io.BytesIO(raw))
+
+        self.assertEqual(used_location(s_location), used_location(location))
+        self.assertEqual(used_periods(s_content), used_periods(content))
+        self.assertEqual(s_all_crimes, all_crimes)
+
+    @unittest.skipIf(analyze.ijson is None, "ijson not installed")
+    def test_stream_matches_full_parse(self):
+        self.assert_stream_matches_full_parse(load_sample())
+
+    @unittest.skipIf(analyze.ijson is None, "ijson not installed")
+    def test_stream_matches_full_parse_with_missing_fields(self):
+        self.assert_stream_matches_full_parse(
+            b'{"location": {"x": 1.5}, "content": {"night": {"score": 250000,'
+            b' "occurrencesWithinCriminalDangerZones": [{"crimeType": 7}, {"count": 3},'
+            b' {"crimeType": 7, "count": 2}]}, "other": {"score": 1}}}'
+        )
+
+
+class JsonHelpersTest(unittest.TestCase):
+    @unittest.skipIf(analyze.orjson is None, "orjson not installed")
+    def test_orjson_matches_stdlib(self):
+        raw = load_sample()
+        parsed = analyze.json_loads(raw)
+        with mock.patch.object(analyze, "orjson", None):
+            self.assertEqual(analyze.json_loads(raw), parsed)
+            stdlib_dumped = analyze.json_dumps(parsed, pretty=True)
+
+        self.assertEqual(analyze.json_loads(analyze.json_dumps(parsed).encode("utf-8")), parsed)
+        self.assertEqual(analyze.json_loads(stdlib_dumped.encode("utf-8")), parsed)
+
+
+if __name__ == "__main__":
+    unittest.main()